@@ -8,26 +8,204 @@ Version: 2.1.1
 License: MIT
 """
 
+import argparse
+import hashlib
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, urlencode
+from urllib.parse import urljoin, urlparse, urlencode, parse_qsl
 from tqdm import tqdm
 import re
-import time
+import shutil
+from functools import lru_cache
 from pathlib import Path
 import fontTools.ttLib as ttLib
 from io import BytesIO
             
 # Import additional dependencies
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
+import itertools
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                FIRST_COMPLETED, as_completed, wait)
 import threading
 import zipfile
 import jsbeautifier
 import cssbeautifier
 from pathlib import Path
 
+# Prefer the C-backed lxml parser when available; html.parser is the fallback
+try:
+    import lxml  # noqa: F401
+    DEFAULT_HTML_PARSER = 'lxml'
+except ImportError:
+    DEFAULT_HTML_PARSER = 'html.parser'
+
+# Optional constant-memory dedup for large crawls; falls back to an exact set
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+# Optional on-disk HTTP cache: repeat crawls against the same site turn
+# page and stylesheet fetches into local sqlite reads
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# Only advertise brotli when urllib3 can actually decode it; mirror its
+# own preference for brotlicffi over the pure brotli package
+try:
+    import brotlicffi as _brotli  # noqa: F401
+except ImportError:
+    try:
+        import brotli as _brotli  # noqa: F401
+    except ImportError:
+        _brotli = None
+
+USER_AGENT = "webber/2.1.1"
+
+# Precompiled patterns for the per-element/per-download hot paths
+_CSS_URL_RE = re.compile(r'url\(["\']?([^"\'()]+)["\']?\)')
+_SAFE_NAME_RE = re.compile(r'[<>:"/\\|?*\s]')
+_SRCSET_SPLIT = re.compile(r'\s*,\s*')
+
+# Extension tuples for str.endswith, which accepts a tuple and runs in C
+_IMAGE_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+_VECTOR_EXTS = ('.svg',)
+_VIDEO_EXTS = ('.mp4', '.webm', '.mov', '.avi', '.mkv', '.m4v')
+_FONT_EXTS = ('.woff', '.woff2', '.ttf', '.otf')
+
+# Query parameters carrying these markers are stripped during normalization
+_TRACKING_PREFIXES = ('utm_', 'fbclid', 'ref_')
+
+# Font and @import patterns compiled once; process_stylesheet runs them
+# against every stylesheet on every crawled page
+_CSS_FONT_PATTERNS = (
+    # @font-face src URLs
+    re.compile(r'@font-face[^}]*?src:[^;}]*?url\(["\']?([^"\'()]+\.(?:woff2?|ttf|otf))["\']?\)', re.IGNORECASE),
+    # Generic URL pattern for font files
+    re.compile(r'url\(["\']?([^"\'()]+\.(?:woff2?|ttf|otf))["\']?\)', re.IGNORECASE),
+    # Font file direct links
+    re.compile(r'href=["\']([^"\']+\.(?:woff2?|ttf|otf))["\']', re.IGNORECASE),
+)
+_CSS_IMPORT_RE = re.compile(r'@import\s+(?:url\(["\']?([^"\'()]+)["\']?\)|["\']([^"\']+)["\'])')
+
+# Fallback extension detection for URLs without one: first marker found in
+# the lowercased URL wins, mapped to its canonical extension
+_IMAGE_EXT_MARKERS = (('.jpeg', '.jpg'), ('.jpg', '.jpg'), ('.png', '.png'))
+_VIDEO_EXT_MARKERS = (('.mp4', '.mp4'), ('.webm', '.webm'))
+
+# Single-pass character replacement table for unsafe filename characters
+_SAFE_NAME_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?* \t\n\r\v\f'})
+
+# Extension -> media category, derived from the tuples above
+_EXT_CATEGORY = {}
+for _exts, _category in ((_IMAGE_EXTS, 'image'), (_VECTOR_EXTS, 'vector'),
+                         (_VIDEO_EXTS, 'video'), (_FONT_EXTS, 'font')):
+    for _ext in _exts:
+        _EXT_CATEGORY[_ext] = _category
+
+def _url_path(url):
+    """Lowercased URL path with any query string or fragment stripped."""
+    return url.split('?', 1)[0].split('#', 1)[0].lower()
+
+def _classify_url(url):
+    """Classify a URL as 'image', 'vector', 'video', 'font', or None."""
+    path = _url_path(url)
+    dot = path.rfind('.')
+    if dot == -1:
+        return None
+    return _EXT_CATEGORY.get(path[dot:])
+
+@lru_cache(maxsize=8192)
+def _is_valid_url(url, base_domain):
+    """Validate that the URL is well-formed and belongs to base_domain."""
+    try:
+        parsed = urlparse(url)
+        return all([parsed.scheme, parsed.netloc]) and parsed.netloc == base_domain
+    except ValueError:
+        return False
+
+@lru_cache(maxsize=8192)
+def _normalize_url(url):
+    """Normalize URL by removing fragments and some query parameters.
+
+    Pure function of the URL, so results are memoized: site chrome
+    (navigation links, logos) repeats on nearly every crawled page.
+    """
+    try:
+        parsed = urlparse(url)
+        # Canonical host: case-insensitive per RFC, and default ports are
+        # noise — http://Host:80/ and http://host/ are the same page
+        netloc = (parsed.hostname or '').lower()
+        if parsed.port and parsed.port != {'http': 80, 'https': 443}.get(parsed.scheme):
+            netloc = f"{netloc}:{parsed.port}"
+        path = parsed.path or '/'
+        if parsed.query:
+            # parse_qsl handles flag-style params (?foo&bar=1) and '=' in
+            # values, which the old manual split tripped over
+            # startswith with a tuple is a single C-level scan, and a prefix
+            # match avoids stripping params that merely contain a marker
+            # Sorted so param order never makes two URLs look distinct
+            params = sorted((key, value)
+                            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                            if not key.lower().startswith(_TRACKING_PREFIXES))
+
+            if params:
+                return f"{parsed.scheme}://{netloc}{path}?{urlencode(params)}"
+        return f"{parsed.scheme}://{netloc}{path}"
+    except Exception as e:
+        print(f"\nError normalizing URL {url}: {str(e)}")
+        return url  # Return original URL if normalization fails
+
+def create_session(retries=0, pool_maxsize=32, cache=False):
+    """Create a requests.Session with connection pooling and keep-alive.
+
+    With cache=True and requests_cache installed, the session reads and
+    writes a one-hour on-disk cache — meant for page/CSS fetches, not
+    for media payloads.
+    """
+    if cache and requests_cache is not None:
+        session = requests_cache.CachedSession(
+            '.webber_cache', backend='sqlite', expire_after=3600,
+            allowable_codes=(200, 301, 302))
+    else:
+        session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    # Ask for brotli too when decodable; requests only advertises
+    # gzip/deflate on its own, and sending 'br' without a decoder would
+    # hand undecoded bytes to the HTML parser
+    if _brotli is not None:
+        session.headers['Accept-Encoding'] = 'gzip, br, deflate'
+
+    # Retries live in the adapter: exponential backoff, Retry-After
+    # support, and no retry branches left in the calling code
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+        ) if retries else 0
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+_shared_session = None
+
+def get_shared_session():
+    """Return the lazily-created session shared by the download helpers."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session(retries=3)
+    return _shared_session
+
 class WebCrawler:
     """A class to manage website crawling and media discovery."""
     
@@ -47,64 +225,72 @@ class WebCrawler:
                     return 'xml'
             except (ImportError, AttributeError):
                 pass
-        return 'html.parser'
+        return DEFAULT_HTML_PARSER
     
-    def __init__(self, start_url, max_depth=3, max_pages=100):
+    def __init__(self, start_url, max_depth=3, max_pages=100, use_cache=True,
+                 max_workers=16):
         self.start_url = start_url
         self.max_depth = max_depth
         self.max_pages = max_pages
+        self.max_workers = max_workers
         
         # Parse the start URL to get the base domain
         parsed = urlparse(start_url)
         self.base_domain = parsed.netloc
         self.base_scheme = parsed.scheme
         
-        # Threading-safe sets for tracking
-        self.visited_urls = set()
+        # Threading-safe sets for tracking. With pybloom_live installed the
+        # visited set is a scalable Bloom filter (constant memory, <0.1%
+        # chance of wrongly skipping a page); otherwise an exact set.
+        if ScalableBloomFilter is not None:
+            self.visited_urls = ScalableBloomFilter(
+                initial_capacity=max(max_pages * 10, 1000), error_rate=0.001)
+        else:
+            self.visited_urls = set()
         self.visited_lock = threading.Lock()
+        # Merged by the crawl coordinator thread (or the caller for
+        # single-page extraction); fonts keep a lock because stylesheet
+        # workers update them mid-page
         self.image_urls = set()
-        self.images_lock = threading.Lock()
         self.vector_urls = set()
-        self.vectors_lock = threading.Lock()
         self.video_urls = set()
-        self.videos_lock = threading.Lock()
         
         # Progress tracking
         self.pages_processed = 0
-        self.progress_lock = threading.Lock()
+        # itertools.count hands out page numbers atomically under the GIL,
+        # so no lock is needed around the per-page counter
+        self._page_counter = itertools.count(1)
         self.font_urls = set()
         self.fonts_lock = threading.Lock()
+        # Fonts found per fetched stylesheet; shared CSS is linked from
+        # nearly every page, so cache results across the whole crawl
+        self.css_cache = {}
+        self.css_cache_lock = threading.Lock()
+
+        # Pooled session so page and stylesheet fetches reuse connections;
+        # cached on disk when requests_cache is available
+        self.uses_cache = bool(use_cache and requests_cache is not None)
+        self.session = create_session(retries=3, cache=use_cache)
     
     def is_valid_url(self, url):
         """Validate if the provided URL is well-formed and matches the base domain."""
-        try:
-            parsed = urlparse(url)
-            return all([parsed.scheme, parsed.netloc]) and parsed.netloc == self.base_domain
-        except ValueError:
-            return False
+        return _is_valid_url(url, self.base_domain)
     
     def is_valid_image_url(self, url):
         """Check if the URL points to a regular image file."""
-        image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-        parsed = urlparse(url)
-        return any(parsed.path.lower().endswith(ext) for ext in image_extensions)
+        return _url_path(url).endswith(_IMAGE_EXTS)
 
     def is_valid_vector_url(self, url):
         """Check if the URL points to an SVG vector file."""
-        parsed = urlparse(url)
-        return parsed.path.lower().endswith('.svg')
+        return _url_path(url).endswith(_VECTOR_EXTS)
 
     def is_valid_video_url(self, url):
         """Check if the URL points to a video file."""
-        video_extensions = {'.mp4', '.webm', '.mov', '.avi', '.mkv', '.m4v'}
-        parsed = urlparse(url)
-        return any(parsed.path.lower().endswith(ext) for ext in video_extensions)
-        
+        return _url_path(url).endswith(_VIDEO_EXTS)
+
     def is_valid_font_url(self, url):
         """Check if the URL points to a font file."""
-        font_extensions = {'.woff', '.woff2', '.ttf', '.otf'}
-        parsed = urlparse(url)
-        return any(parsed.path.lower().endswith(ext) for ext in font_extensions)
+        return _url_path(url).endswith(_FONT_EXTS)
 
     def process_stylesheet(self, css_url, css_content=None, visited_stylesheets=None):
         """Process a stylesheet and extract font URLs."""
@@ -116,69 +302,53 @@ class WebCrawler:
         
         visited_stylesheets.add(css_url)
         
+        fetched = css_content is None
+        if fetched:
+            with self.css_cache_lock:
+                cached = self.css_cache.get(css_url)
+            if cached is not None:
+                if cached:
+                    with self.fonts_lock:
+                        self.font_urls.update(cached)
+                return
+        
+        found_fonts = set()
         try:
             # Get CSS content if not provided
             if css_content is None:
-                response = requests.get(css_url, timeout=10)
+                response = self.session.get(css_url, timeout=10)
                 response.raise_for_status()
                 css_content = response.text
             
-            # Font patterns to match
-            font_patterns = [
-                # @font-face src URLs
-                r'@font-face[^}]*?src:[^;}]*?url\(["\']?([^"\'()]+\.(?:woff2?|ttf|otf))["\']?\)',
-                # Generic URL pattern for font files
-                r'url\(["\']?([^"\'()]+\.(?:woff2?|ttf|otf))["\']?\)',
-                # Font file direct links
-                r'href=["\']([^"\']+\.(?:woff2?|ttf|otf))["\']'
-            ]
-            
-            # Extract fonts using patterns
-            for pattern in font_patterns:
-                matches = re.finditer(pattern, css_content, re.IGNORECASE)
-                for match in matches:
+            # Extract fonts using the precompiled patterns
+            for pattern in _CSS_FONT_PATTERNS:
+                for match in pattern.finditer(css_content):
                     font_url = match.group(1)
                     full_url = urljoin(css_url, font_url)
                     if self.is_valid_font_url(full_url):
-                        with self.fonts_lock:
-                            self.font_urls.add(self.normalize_url(full_url))
+                        found_fonts.add(self.normalize_url(full_url))
+            
+            if found_fonts:
+                with self.fonts_lock:
+                    self.font_urls.update(found_fonts)
             
             # Look for @import rules and process them
-            import_pattern = r'@import\s+(?:url\(["\']?([^"\'()]+)["\']?\)|["\']([^"\']+)["\'])'
-            for match in re.finditer(import_pattern, css_content):
+            for match in _CSS_IMPORT_RE.finditer(css_content):
                 import_url = match.group(1) or match.group(2)
                 full_import_url = urljoin(css_url, import_url)
                 self.process_stylesheet(full_import_url, visited_stylesheets=visited_stylesheets)
                 
         except requests.exceptions.RequestException:
             pass
+        
+        if fetched:
+            # Cache failures as empty too, so broken URLs are not re-hit
+            with self.css_cache_lock:
+                self.css_cache[css_url] = frozenset(found_fonts)
 
     def normalize_url(self, url):
         """Normalize URL by removing fragments and some query parameters."""
-        try:
-            parsed = urlparse(url)
-            if parsed.query:
-                # Handle cases where query params don't have values
-                params = {}
-                for param in parsed.query.split('&'):
-                    if not param:  # Skip empty parameters
-                        continue
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        # Filter out tracking parameters
-                        if not any(track in key.lower() for track in ['utm_', 'fbclid', 'ref_']):
-                            params[key] = value
-                    else:
-                        # Handle parameters without values
-                        if not any(track in param.lower() for track in ['utm_', 'fbclid', 'ref_']):
-                            params[param] = ''
-                
-                if params:
-                    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{urlencode(params)}"
-            return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-        except Exception as e:
-            print(f"\nError normalizing URL {url}: {str(e)}")
-            return url  # Return original URL if normalization fails
+        return _normalize_url(url)
 
     def process_video_element(self, element, current_url):
         """Process a video-related element and extract video URLs."""
@@ -208,7 +378,7 @@ class WebCrawler:
         # Convert relative URLs to absolute
         return [urljoin(current_url, src) for src in sources]
 
-    def extract_media(self, html, current_url, parser='html.parser'):
+    def extract_media(self, html, current_url, parser=DEFAULT_HTML_PARSER):
         """Extract all valid links, image URLs, vector URLs, and video URLs from HTML/XML content."""
         try:
             soup = BeautifulSoup(html, parser)
@@ -219,25 +389,55 @@ class WebCrawler:
         images = set()
         vectors = set()
         videos = set()
-
-        # Extract regular links
-        for a in soup.find_all('a', href=True):
-            url = urljoin(current_url, a['href'])
-            if self.is_valid_url(url):
-                links.add(self.normalize_url(url))
-
-        # Extract media from various sources
-        for element in soup.find_all(['img', 'source', 'picture', 'object', 'embed', 'link', 'video', 'iframe']):
-            sources = []
-            # Check various attributes
-            for attr in ['src', 'data-src', 'href']:
-                if element.get(attr):
-                    sources.append(element[attr])
-            if element.get('srcset'):
-                sources.extend(src.strip().split()[0] for src in element['srcset'].split(','))
-            if element.get('style'):
-                bg_matches = re.findall(r'url\(["\']?([^"\'()]+)["\']?\)', element['style'])
-                sources.extend(bg_matches)
+        # Raw attribute values already handled on this page; skips the
+        # urljoin/classify work when the same src repeats across elements
+        seen_raw = set()
+        stylesheet_urls = set()
+        page_fonts = set()
+
+        # Single tree walk covering links, media elements, stylesheets,
+        # and inline styles instead of one find_all pass per category
+        for element in soup.find_all(['a', 'style', 'img', 'source', 'picture',
+                                      'object', 'embed', 'link', 'video', 'iframe']):
+            if element.name == 'a':
+                href = element.get('href')
+                if href:
+                    url = urljoin(current_url, href)
+                    if self.is_valid_url(url):
+                        links.add(self.normalize_url(url))
+                continue
+
+            if element.name == 'style':
+                self.process_stylesheet(current_url, css_content=element.string)
+                continue
+
+            if element.name == 'link':
+                rel = element.get('rel') or []
+                # External stylesheets and font preloads carry font URLs;
+                # collect them here and fetch concurrently after the walk
+                if ('stylesheet' in rel or 'preload' in rel) and \
+                        (element.get('as') == 'font' or rel == ['stylesheet']):
+                    stylesheet_urls.add(urljoin(current_url, element.get('href', '')))
+                if 'preload' in rel and element.get('as') == 'font':
+                    font_url = urljoin(current_url, element.get('href', ''))
+                    if self.is_valid_font_url(font_url):
+                        page_fonts.add(self.normalize_url(font_url))
+
+            # Collect candidate sources into a set so srcset resolution
+            # variants and repeated attributes are classified only once
+            sources = set()
+            for attr in ('src', 'data-src', 'href'):
+                value = element.get(attr)
+                if value:
+                    sources.add(value)
+            srcset = element.get('srcset')
+            if srcset:
+                for entry in _SRCSET_SPLIT.split(srcset):
+                    if entry:
+                        sources.add(entry.split(None, 1)[0])
+            style = element.get('style')
+            if style:
+                sources.update(_CSS_URL_RE.findall(style))
 
             # Additional video-specific processing
             if element.name in ['video', 'iframe']:
@@ -246,19 +446,25 @@ class WebCrawler:
                     if self.is_valid_video_url(src):
                         videos.add(self.normalize_url(src))
 
-            # Process all found sources from standard attributes
+            # Process all found sources from standard attributes; one
+            # classification per URL, and only media URLs get normalized
             for src in sources:
+                if src in seen_raw:
+                    continue
+                seen_raw.add(src)
                 url = urljoin(current_url, src)
+                category = _classify_url(url)
+                if category is None:
+                    continue
                 normalized_url = self.normalize_url(url)
-                if self.is_valid_image_url(url):
+                if category == 'image':
                     images.add(normalized_url)
-                elif self.is_valid_vector_url(url):
+                elif category == 'vector':
                     vectors.add(normalized_url)
-                elif self.is_valid_video_url(url):
+                elif category == 'video':
                     videos.add(normalized_url)
-                elif self.is_valid_font_url(url):
-                    with self.fonts_lock:
-                        self.font_urls.add(normalized_url)
+                else:  # font
+                    page_fonts.add(normalized_url)
 
             # Check for video-specific data attributes
             if element.name == 'div' and any(attr in element.attrs for attr in ['data-video-url', 'data-video-src']):
@@ -267,30 +473,18 @@ class WebCrawler:
                     if self.is_valid_video_url(src):
                         videos.add(self.normalize_url(src))
 
-        # Update media sets with thread safety
-        with self.images_lock:
-            self.image_urls.update(images)
-        with self.vectors_lock:
-            self.vector_urls.update(vectors)
-        with self.videos_lock:
-            self.video_urls.update(videos)
-
-        # Process stylesheets
-        for link in soup.find_all('link', rel=['stylesheet', 'preload']):
-            if link.get('as') == 'font' or link.get('rel') == ['stylesheet']:
-                css_url = urljoin(current_url, link.get('href', ''))
-                self.process_stylesheet(css_url)
-
-        # Process inline styles
-        for style in soup.find_all('style'):
-            self.process_stylesheet(current_url, css_content=style.string)
-
-        # Check for font preload links
-        for link in soup.find_all('link', rel='preload', as_='font'):
-            font_url = urljoin(current_url, link.get('href', ''))
-            if self.is_valid_font_url(font_url):
-                with self.fonts_lock:
-                    self.font_urls.add(self.normalize_url(font_url))
+        # Fetch external stylesheets in parallel instead of blocking the
+        # page walk on each CSS round-trip in turn
+        if stylesheet_urls:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for _ in executor.map(self.process_stylesheet, stylesheet_urls):
+                    pass
+
+        # Fonts merge here because stylesheet workers feed the same set;
+        # the other categories are merged lock-free by the caller
+        if page_fonts:
+            with self.fonts_lock:
+                self.font_urls.update(page_fonts)
 
         return links, images, vectors, videos
 
@@ -300,24 +494,25 @@ class WebCrawler:
             return set(), set(), set(), set()
 
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            
+
             if not self.is_parseable_content(response):
                 return set(), set(), set(), set()
             
-            with self.progress_lock:
-                self.pages_processed += 1
+            self.pages_processed = next(self._page_counter)
             
             try:
                 parser = self.get_parser(response.headers.get('content-type', ''))
-                return self.extract_media(response.text, url, parser=parser)
+                # Hand the parser raw bytes: BeautifulSoup detects the
+                # encoding itself, skipping requests' slower charset probe
+                return self.extract_media(response.content, url, parser=parser)
             except Exception as e:
-                print(f"\nError parsing {url}: {str(e)}")
+                tqdm.write(f"Error parsing {url}: {str(e)}")
                 return set(), set(), set(), set()
-            
+
         except requests.exceptions.RequestException as e:
-            print(f"\nError crawling {url}: {e}")
+            tqdm.write(f"Error crawling {url}: {e}")
             return set(), set(), set(), set()
 
     def crawl(self, media_type='images'):
@@ -328,23 +523,38 @@ class WebCrawler:
             media_type (str): Type of media to crawl for ('images', 'vectors', 'videos', or 'fonts')
         """
         print(f"Starting crawl from {self.start_url}")
-        to_visit = deque([(self.start_url, 0)])  # (url, depth)
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            while to_visit and self.pages_processed < self.max_pages:
-                current_url, depth = to_visit.popleft()
-                
-                with self.visited_lock:
-                    if current_url in self.visited_urls:
+
+        # tqdm rate-limits redraws, unlike a raw print per page
+        with tqdm(total=self.max_pages, desc="Crawling pages") as pbar, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self.visited_lock:
+                self.visited_urls.add(_url_key(self.start_url))
+            # Map of in-flight Future -> (url, depth)
+            pending = {executor.submit(self.crawl_page, self.start_url, 0): (self.start_url, 0)}
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current_url, depth = pending.pop(future)
+                    if self.pages_processed > pbar.n:
+                        pbar.update(self.pages_processed - pbar.n)
+                    links, images, vectors, videos = future.result()
+                    # Single consumer thread, so the shared sets need no lock
+                    self.image_urls |= images
+                    self.vector_urls |= vectors
+                    self.video_urls |= videos
+
+                    if self.pages_processed >= self.max_pages or depth + 1 > self.max_depth:
                         continue
-                    self.visited_urls.add(current_url)
-                
-                print(f"\rCrawling page {self.pages_processed + 1}/{self.max_pages}: {current_url}", end="")
-                links, _, _, _ = self.crawl_page(current_url, depth)
-                
-                for link in links:
-                    if link not in self.visited_urls:
-                        to_visit.append((link, depth + 1))
+
+                    for link in links:
+                        # Mark visited at submit time so no link is scheduled twice
+                        link_key = _url_key(link)
+                        with self.visited_lock:
+                            if link_key in self.visited_urls:
+                                continue
+                            self.visited_urls.add(link_key)
+                        pending[executor.submit(self.crawl_page, link, depth + 1)] = (link, depth + 1)
         
         if media_type == 'vectors':
             print(f"\nCrawl complete! Found {len(self.vector_urls)} unique vectors across {self.pages_processed} pages")
@@ -359,31 +569,34 @@ class WebCrawler:
             print(f"\nCrawl complete! Found {len(self.image_urls)} unique images across {self.pages_processed} pages")
             return list(self.image_urls)
 
+@lru_cache(maxsize=8192)
 def get_safe_filename(url, media_type='image'):
-    """Generate safe filename from URL while preserving extension."""
+    """Generate safe filename from URL while preserving extension.
+
+    Memoized: the same URL is named during extraction, download, and
+    HTML path rewriting.
+    """
     clean_url = url.split('?')[0].split('#')[0]
-    basename = os.path.basename(clean_url)
-    name, ext = os.path.splitext(basename)
+    # Plain string ops instead of os.path: the input is a URL, not a path
+    tail = clean_url.rpartition('/')[2]
+    name, dot, ext = tail.rpartition('.')
+    if dot and name:
+        ext = '.' + ext
+    else:
+        name, ext = tail, ''
     
     if not ext:
+        lower_url = url.lower()
         if media_type == 'vector':
             ext = '.svg'  # Only SVG supported
         elif media_type == 'video':
-            if '.mp4' in url.lower():
-                ext = '.mp4'
-            elif '.webm' in url.lower():
-                ext = '.webm'
-            else:
-                ext = '.mp4'  # Default to mp4
+            ext = next((canon for marker, canon in _VIDEO_EXT_MARKERS
+                        if marker in lower_url), '.mp4')
         else:  # image
-            if '.jpg' in url.lower() or '.jpeg' in url.lower():
-                ext = '.jpg'
-            elif '.png' in url.lower():
-                ext = '.png'
-            else:
-                ext = '.jpg'  # Default to jpg
-    
-    safe_name = re.sub(r'[<>:"/\\|?*\s]', '_', name)
+            ext = next((canon for marker, canon in _IMAGE_EXT_MARKERS
+                        if marker in lower_url), '.jpg')
+
+    safe_name = name.translate(_SAFE_NAME_TABLE)
     if not safe_name:
         return f"media{ext}"
     if len(safe_name) > 200:
@@ -391,69 +604,186 @@ def get_safe_filename(url, media_type='image'):
     
     return f"{safe_name}{ext}"
 
-def download_media_from_urls(urls, download_folder, max_size_mb=10, file_types=None, 
-                           retry_count=3, media_type='image'):
-    """Generic function to download media files from URLs."""
-    max_size = max_size_mb * 1024 * 1024
-    download_path = Path(download_folder)
-    download_path.mkdir(parents=True, exist_ok=True)
+def _url_key(url):
+    """Compact 8-byte key for the visited set.
 
-    successful = 0
-    failed = 0
-    replaced = 0
+    Full URL strings average ~100 bytes each; hashing them down keeps a
+    large crawl's visited set small and its membership tests cache-
+    friendly. blake2b at digest_size=8 is effectively collision-free at
+    crawl scale (~5e-12 for a million pages).
+    """
+    return hashlib.blake2b(url.encode(), digest_size=8).digest()
 
-    with tqdm(total=len(urls), desc=f"Downloading {media_type}s") as pbar:
-        for url in urls:
-            if file_types:
-                ext = os.path.splitext(url)[1].lower()
-                if ext not in file_types:
-                    pbar.update(1)
-                    continue
+class _HashingWriter:
+    """File-like wrapper that feeds every written chunk into a digest."""
 
-            base_name = get_safe_filename(url, media_type=media_type)
-            file_path = download_path / base_name
+    def __init__(self, fileobj, digest):
+        self._fileobj = fileobj
+        self._digest = digest
 
-            if file_path.exists():
-                replaced += 1
+    def write(self, data):
+        self._digest.update(data)
+        return self._fileobj.write(data)
 
-            for attempt in range(retry_count):
-                try:
-                    timeout = 30 if media_type == 'video' else 10
-                    response = requests.get(url, stream=True, timeout=timeout)
-                    response.raise_for_status()
+def _probe_size(session, url):
+    """Return the Content-Length reported by a HEAD request, or None."""
+    try:
+        response = session.head(url, timeout=5, allow_redirects=True)
+        if response.status_code < 400:
+            content_length = response.headers.get('content-length')
+            if content_length:
+                return int(content_length)
+    except (requests.exceptions.RequestException, ValueError):
+        pass
+    return None
+
+def _download_one(url, base_name, replaced, session, download_path, max_size,
+                  max_size_mb, file_types, media_type,
+                  seen_digests, seen_digests_lock):
+    """Download a single media file; returns (status, replaced_existing).
+
+    Retries with backoff are handled by the session's adapter, so a
+    raised RequestException here means the URL is a hard failure.
+    base_name is reserved by the coordinator before submission, so no
+    two in-flight workers ever write the same path. seen_digests is
+    scoped to one download_media_from_urls call, so a repeat run never
+    mistakes its own earlier output for a duplicate.
+    """
+    if file_types:
+        ext = os.path.splitext(url)[1].lower()
+        if ext not in file_types:
+            return 'skipped', False
+
+    file_path = download_path / base_name
+
+    # Cheap HEAD probe so oversize files never open a full GET stream;
+    # servers without HEAD/Content-Length fall through to the GET check
+    probed_size = _probe_size(session, url)
+    if probed_size is not None and probed_size > max_size:
+        print(f"\nSkipped {url}: File size exceeds {max_size_mb}MB")
+        return 'skipped', False
 
-                    content_length = response.headers.get('content-length')
-                    if content_length and int(content_length) > max_size:
-                        print(f"\nSkipped {url}: File size exceeds {max_size_mb}MB")
-                        break
+    try:
+        timeout = 30 if media_type == 'video' else 10
+        response = session.get(url, stream=True, timeout=timeout)
+        response.raise_for_status()
 
-                    with open(file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+        content_length = response.headers.get('content-length')
+        if content_length and int(content_length) > max_size:
+            print(f"\nSkipped {url}: File size exceeds {max_size_mb}MB")
+            return 'skipped', False
+
+        # Copy in C via shutil instead of a Python loop over 8KB chunks.
+        # Scale the buffer with the payload: 1MB for files over 10MB
+        # (and for videos of unknown size), 64KB for small assets.
+        response.raw.decode_content = True
+        if content_length and int(content_length) > 10 * 1024 * 1024:
+            buffer_size = 1024 * 1024
+        elif media_type == 'video':
+            buffer_size = 1024 * 1024
+        else:
+            buffer_size = 65536
+        digest = hashlib.sha256()
+        # Match the file's write buffer to the copy buffer so large
+        # payloads hit the kernel in MB-sized writes, not 8KB ones
+        with open(file_path, 'wb', buffering=buffer_size) as f:
+            shutil.copyfileobj(response.raw, _HashingWriter(f, digest), length=buffer_size)
+
+        # Drop files whose content was already saved under another URL
+        # during this invocation
+        content_digest = digest.digest()
+        with seen_digests_lock:
+            is_duplicate = content_digest in seen_digests
+            seen_digests.add(content_digest)
+        if is_duplicate:
+            os.remove(file_path)
+            return 'duplicate', False
+
+        return 'ok', replaced
 
-                    successful += 1
-                    break
+    except requests.exceptions.RequestException as e:
+        print(f"\nFailed to download {url}: {e}")
+        return 'failed', False
+
+def download_media_from_urls(urls, download_folder, max_size_mb=10, file_types=None,
+                           retry_count=3, media_type='image', session=None,
+                           max_workers=8):
+    """Generic function to download media files from URLs.
+
+    retry_count is honored through the session adapter's Retry policy;
+    sessions built by create_session default to three attempts with
+    exponential backoff.
+    """
+    if session is None:
+        session = get_shared_session()
+    max_size = max_size_mb * 1024 * 1024
+    download_path = Path(download_folder)
+    download_path.mkdir(parents=True, exist_ok=True)
 
-                except requests.exceptions.RequestException as e:
-                    if attempt < retry_count - 1:
-                        time.sleep(2 if media_type == 'video' else 1)
-                        continue
-                    else:
-                        print(f"\nFailed to download {url} after {retry_count} attempts: {e}")
-                        failed += 1
+    # One directory scan up front instead of a stat call per URL
+    existing_names = {entry.name for entry in os.scandir(download_path)}
 
-            pbar.update(1)
+    # Content digests seen this call, so the same bytes served from two
+    # URLs (CDN mirrors, thumbnails reused across pages) store once
+    seen_digests = set()
+    seen_digests_lock = threading.Lock()
+
+    successful = 0
+    failed = 0
+    replaced = 0
+    duplicates = 0
+
+    # Reserve every target filename before submitting: two URLs that
+    # sanitize to the same name would otherwise stream into one file
+    # concurrently and interleave their chunks. Later claimants get a
+    # numbered variant instead.
+    claimed_this_run = set()
+
+    def _claim_name(url):
+        base_name = get_safe_filename(url, media_type=media_type)
+        if base_name in claimed_this_run:
+            stem, ext = os.path.splitext(base_name)
+            counter = 1
+            while base_name in claimed_this_run:
+                base_name = f"{stem}_{counter}{ext}"
+                counter += 1
+        claimed_this_run.add(base_name)
+        return base_name
+
+    with tqdm(total=len(urls), desc=f"Downloading {media_type}s") as pbar:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for url in urls:
+                base_name = _claim_name(url)
+                futures.append(
+                    executor.submit(_download_one, url, base_name,
+                                    base_name in existing_names, session,
+                                    download_path, max_size, max_size_mb,
+                                    file_types, media_type,
+                                    seen_digests, seen_digests_lock))
+            for future in as_completed(futures):
+                status, replaced_existing = future.result()
+                if status == 'ok':
+                    successful += 1
+                    if replaced_existing:
+                        replaced += 1
+                elif status == 'failed':
+                    failed += 1
+                elif status == 'duplicate':
+                    duplicates += 1
+                pbar.update(1)
 
     print(f"\nDownload complete!")
     print(f"Successfully downloaded: {successful} {media_type}s")
     print(f"Replaced existing files: {replaced}")
+    print(f"Duplicate files skipped: {duplicates}")
     print(f"Failed downloads: {failed}")
     if successful > 0:
         print(f"Files saved in: {download_path.absolute()}")
 
-def download_from_single_page(url, media_type='image', download_folder=None, 
-                            max_size_mb=None, file_types=None, retry_count=3):
+def download_from_single_page(url, media_type='image', download_folder=None,
+                            max_size_mb=None, file_types=None, retry_count=3,
+                            max_workers=8, use_cache=True):
     """Download media files from a single webpage."""
     if download_folder is None:
         download_folder = media_type + 's'
@@ -461,16 +791,16 @@ def download_from_single_page(url, media_type='image', download_folder=None,
         max_size_mb = 500 if media_type == 'video' else 10
 
     print(f"Fetching {media_type}s from: {url}")
-    
+
     try:
-        response = requests.get(url, timeout=10)
+        response = get_shared_session().get(url, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Failed to retrieve webpage: {url}\nError: {e}")
         return
 
-    crawler = WebCrawler(url, max_depth=1, max_pages=1)
-    _, images, vectors, videos = crawler.extract_media(response.text, url)
+    crawler = WebCrawler(url, max_depth=1, max_pages=1, use_cache=use_cache)
+    _, images, vectors, videos = crawler.extract_media(response.content, url)
     
     if media_type == 'vector':
         urls = vectors
@@ -490,80 +820,76 @@ def download_from_single_page(url, media_type='image', download_folder=None,
         max_size_mb,
         file_types,
         retry_count,
-        media_type
+        media_type,
+        max_workers=max_workers
     )
 
-def convert_font(font_data, from_format, to_format):
-    """Convert font from one format to another using fontTools."""
+def convert_font_batch(font_data, from_format, to_formats):
+    """Convert a font to several formats, parsing the source only once.
+
+    Returns a dict mapping each normalized target format to the converted
+    bytes, or None where that conversion failed.
+    """
+    from_format = from_format.lstrip('.').lower()
+    to_formats = [fmt.lstrip('.').lower() for fmt in to_formats]
+    results = {fmt: None for fmt in to_formats}
     try:
-        # Remove leading dots and normalize format names
-        from_format = from_format.lstrip('.').lower()
-        to_format = to_format.lstrip('.').lower()
-        
         # Setup flavor for source format
         flavor = from_format if from_format in ('woff', 'woff2') else None
         
-        # Read and validate the font
+        # Read and validate the font once for all targets
         font = ttLib.TTFont(BytesIO(font_data), flavor=flavor)
         try:
             font.validate()
         except ttLib.TTLibError as e:
             print(f"\nInvalid font file: {str(e)}")
-            return None
-        
-        # Prepare output buffer
-        output = BytesIO()
-        
-        # Set proper flavor for target format
-        font.flavor = to_format if to_format in ('woff', 'woff2') else None
-        
-        # Save in new format
+            return results
+    except Exception as e:
+        print(f"\nError during font conversion: {str(e)}")
+        return results
+    
+    for to_format in to_formats:
         try:
-            font.save(output, to_format)
+            output = BytesIO()
+            # Set proper flavor for target format
+            font.flavor = to_format if to_format in ('woff', 'woff2') else None
+            font.save(output)
             # Verify the converted font is valid
             output.seek(0)
             test_font = ttLib.TTFont(output, flavor=font.flavor)
             test_font.validate()
-            output.seek(0)
-            return output.getvalue()
+            results[to_format] = output.getvalue()
         except Exception as e:
             print(f"\nError saving converted font: {str(e)}")
-            return None
-            
-    except Exception as e:
-        print(f"\nError during font conversion: {str(e)}")
-        return None
+    return results
+
+def convert_font(font_data, from_format, to_format):
+    """Convert font from one format to another using fontTools."""
+    to_format = to_format.lstrip('.').lower()
+    return convert_font_batch(font_data, from_format, [to_format])[to_format]
 
 def download_fonts(url, download_folder=None, max_size_mb=10, file_types=None, 
-                   retry_count=3, max_depth=1, max_pages=1):
+                   retry_count=3, max_depth=1, max_pages=1, use_cache=True):
     """Download and convert fonts from a website."""
     if download_folder is None:
         download_folder = 'fonts'
     
     print(f"Fetching fonts from: {url}")
     
-    # Create temporary directories
     parsed_url = urlparse(url)
     domain = parsed_url.netloc.replace("www.", "")
-    site_name = re.sub(r'[<>:"/\\|?*\s]', '_', domain)
-    
-    temp_dir = Path(f"{download_folder}/temp_{site_name}")
-    woff_dir = temp_dir / "woff"
-    ttf_dir = temp_dir / "ttf"
-    otf_dir = temp_dir / "otf"
-    
-    for directory in [woff_dir, ttf_dir, otf_dir]:
-        directory.mkdir(parents=True, exist_ok=True)
+    site_name = _SAFE_NAME_RE.sub('_', domain)
     
     # Initialize crawler and get font URLs
-    crawler = WebCrawler(url, max_depth=max_depth, max_pages=max_pages)
+    crawler = WebCrawler(url, max_depth=max_depth, max_pages=max_pages,
+                         use_cache=use_cache)
     if max_depth > 1:
         font_urls = crawler.crawl(media_type='fonts')
     else:
         try:
-            response = requests.get(url, timeout=10)
+            response = crawler.session.get(url, timeout=10)
             response.raise_for_status()
-            _, _, _, _ = crawler.extract_media(response.text, url)
+            _, _, _, _ = crawler.extract_media(response.content, url)
             font_urls = list(crawler.font_urls)
         except requests.exceptions.RequestException as e:
             print(f"Failed to retrieve webpage: {url}\nError: {e}")
@@ -575,37 +901,57 @@ def download_fonts(url, download_folder=None, max_size_mb=10, file_types=None,
     
     print(f"Found {len(font_urls)} fonts. Starting download...")
     
-    # Download and convert fonts
     max_size = max_size_mb * 1024 * 1024
     successful = 0
     failed = 0
     
-    with tqdm(total=len(font_urls), desc="Processing fonts") as pbar:
-        for url in font_urls:
+    # Archive folder per format; entries go straight into the zip
+    format_dirs = {
+        '.woff': 'woff',
+        '.ttf': 'ttf',
+        '.otf': 'otf'
+    }
+    archive_entries = {}
+    
+    # Font payloads bypass the on-disk cache; they are written to disk
+    # anyway and would bloat the sqlite store
+    font_session = get_shared_session() if crawler.uses_cache else crawler.session
+    
+    def fetch_font(font_url):
+        response = font_session.get(font_url, stream=True, timeout=10)
+        response.raise_for_status()
+        content_length = response.headers.get('content-length')
+        if content_length and int(content_length) > max_size:
+            raise ValueError(f"File size exceeds {max_size_mb}MB")
+        return response.content
+    
+    # Download all font payloads concurrently into memory
+    fonts = {}
+    with tqdm(total=len(font_urls), desc="Downloading fonts") as pbar, \
+            ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(fetch_font, font_url): font_url
+                   for font_url in font_urls}
+        for future in as_completed(futures):
+            font_url = futures[future]
+            try:
+                fonts[font_url] = future.result()
+            except Exception as e:
+                print(f"\nError downloading font from {font_url}: {str(e)}")
+                failed += 1
+            pbar.update(1)
+    
+    # Validate and save originals, then run the CPU-bound fontTools
+    # conversions on a process pool — TTFont.save is pure Python, so
+    # threads alone cannot parallelize it
+    pending = {}
+    conversion_failures = {}
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for url, font_data in fonts.items():
             try:
-                # Download font
-                response = requests.get(url, stream=True, timeout=10)
-                response.raise_for_status()
-                
-                content_length = response.headers.get('content-length')
-                if content_length and int(content_length) > max_size:
-                    print(f"\nSkipped {url}: File size exceeds {max_size_mb}MB")
-                    continue
-                
-                font_data = response.content
                 original_ext = os.path.splitext(url)[1].lower()
-                
-                # Generate base filename
                 base_name = get_safe_filename(url, 'font')
                 name_without_ext = os.path.splitext(base_name)[0]
                 
-                # Convert and save in all formats
-                format_dirs = {
-                    '.woff': woff_dir,
-                    '.ttf': ttf_dir,
-                    '.otf': otf_dir
-                }
-                
                 # First validate the downloaded font
                 try:
                     test_font = ttLib.TTFont(BytesIO(font_data))
@@ -613,55 +959,52 @@ def download_fonts(url, download_folder=None, max_size_mb=10, file_types=None,
                 except Exception as e:
                     print(f"\nSkipping invalid font from {url}: {str(e)}")
                     failed += 1
-                    pbar.update(1)
                     continue
                 
-                # Save original format
-                with open(format_dirs[original_ext] / f"{name_without_ext}{original_ext}", 'wb') as f:
-                    f.write(font_data)
-                
-                # Convert to other formats
-                conversion_failures = 0
-                for target_ext, target_dir in format_dirs.items():
-                    if target_ext != original_ext:
-                        converted = convert_font(font_data, original_ext[1:], target_ext[1:])
-                        if converted:
-                            with open(target_dir / f"{name_without_ext}{target_ext}", 'wb') as f:
-                                f.write(converted)
-                        else:
-                            conversion_failures += 1
-                            print(f"\nFailed to convert {name_without_ext} to {target_ext}")
-                
-                if conversion_failures == len(format_dirs) - 1:
-                    # If all conversions failed, count this as a failed font
-                    failed += 1
-                else:
-                    successful += 1
+                # Keep original format
+                folder = format_dirs[original_ext]
+                archive_entries[f"{folder}/{name_without_ext}{original_ext}"] = font_data
                 
-                successful += 1
+                conversion_failures[url] = 0
+                # One batch task per source font so the sfnt tables are
+                # parsed once for both targets
+                targets = [ext[1:] for ext in format_dirs if ext != original_ext]
+                future = executor.submit(convert_font_batch, font_data,
+                                         original_ext[1:], targets)
+                pending[future] = (url, name_without_ext)
                 
             except Exception as e:
                 print(f"\nError processing font from {url}: {str(e)}")
                 failed += 1
-            
-            pbar.update(1)
+        
+        with tqdm(total=len(pending), desc="Converting fonts") as pbar:
+            for future in as_completed(pending):
+                url, name_without_ext = pending[future]
+                for fmt, converted in future.result().items():
+                    if converted:
+                        archive_entries[f"{fmt}/{name_without_ext}.{fmt}"] = converted
+                    else:
+                        conversion_failures[url] += 1
+                        print(f"\nFailed to convert {name_without_ext} to .{fmt}")
+                pbar.update(1)
+    
+    for url, failures in conversion_failures.items():
+        if failures == len(format_dirs) - 1:
+            # If all conversions failed, count this as a failed font
+            failed += 1
+        else:
+            successful += 1
     
-    # Create zip archive
+    # Create zip archive straight from memory
     fonts_dir = Path(download_folder)
     fonts_dir.mkdir(exist_ok=True)
     zip_name = fonts_dir / f"{site_name}-fonts.zip"
     
     print("\nCreating ZIP archive...")
-    with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for folder, _, files in os.walk(temp_dir):
-            for file in files:
-                file_path = os.path.join(folder, file)
-                arcname = os.path.relpath(file_path, temp_dir)
-                zipf.write(file_path, arcname)
-    
-    # Clean up temporary directory
-    import shutil
-    shutil.rmtree(temp_dir)
+    with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
+        for arcname, data in archive_entries.items():
+            zipf.writestr(arcname, data,
+                          compress_type=_zip_compress_type(arcname))
     
     print(f"\nFont processing complete!")
     print(f"Successfully processed: {successful} fonts")
@@ -669,148 +1012,136 @@ def download_fonts(url, download_folder=None, max_size_mb=10, file_types=None,
     if successful > 0:
         print(f"Fonts archive saved as: {zip_name}")
 
+# Extensions whose payloads are already compressed; deflating them again
+# burns CPU without shrinking the archive.
+_STORED_EXTS = ('.woff2', '.woff', '.png', '.jpg', '.jpeg', '.webp',
+                '.mp4', '.gz', '.zip')
+
+def _zip_compress_type(name):
+    """Pick the zip compression for a file based on its extension."""
+    if name.lower().endswith(_STORED_EXTS):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+_BEAUTIFY_MAX_BYTES = 1024 * 1024
+
+def _fetch_code_asset(session, asset_url, ext):
+    """Download one CSS/JS asset and return its (filename, content) pair.
+
+    Beautification is skipped for payloads over _BEAUTIFY_MAX_BYTES since
+    reformatting minified bundles of that size is pure CPU cost.
+    """
+    response = session.get(asset_url, timeout=10)
+    response.raise_for_status()
+    content = response.text
+    if len(content) <= _BEAUTIFY_MAX_BYTES:
+        beautifier = cssbeautifier if ext == 'css' else jsbeautifier
+        content = beautifier.beautify(content)
+    return get_safe_filename(asset_url, ext), content
+
 def download_website_code(url):
     """Download and organize website source code."""
     print(f"Downloading source code from: {url}")
     
     try:
-        with tqdm(total=5, desc="Website Code Processing") as main_pbar:
-            # Get domain name for folder naming
+        with tqdm(total=4, desc="Website Code Processing") as main_pbar:
+            # Get domain name for archive naming
             parsed_url = urlparse(url)
             domain = parsed_url.netloc.replace("www.", "")
-            site_name = re.sub(r'[<>:"/\\|?*\s]', '_', domain)
-            
-            # Create temporary directory structure
-            main_pbar.set_description("Setting up directory structure")
-            temp_dir = Path(f"code/{site_name}")
-            css_dir = temp_dir / "css"
-            js_dir = temp_dir / "js"
-            assets_dir = temp_dir / "assets"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            css_dir.mkdir(parents=True, exist_ok=True)
-            js_dir.mkdir(parents=True, exist_ok=True)
-            (assets_dir / "images").mkdir(parents=True, exist_ok=True)
-            (assets_dir / "fonts").mkdir(parents=True, exist_ok=True)
-            (assets_dir / "other").mkdir(parents=True, exist_ok=True)
-            main_pbar.update(1)
+            site_name = _SAFE_NAME_RE.sub('_', domain)
 
             # Download main page
             main_pbar.set_description("Downloading main page")
-            response = requests.get(url, timeout=10)
+            session = get_shared_session()
+            response = session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Bytes in: the parser's C-level encoding detection beats
+            # requests' charset guesswork on pages without a declared one
+            soup = BeautifulSoup(response.content, DEFAULT_HTML_PARSER)
             main_pbar.update(1)
 
             # Initialize code files collection
-            html_content = soup.prettify()
             code_files = {
-                'html': html_content,
                 'css': {},
                 'js': {}
             }
 
-            # Process CSS files
+            # One pass over the elements records which asset URL each one
+            # points at, so the later path rewrite never recomputes
+            # urljoin or filenames. Pairs rather than a Tag-keyed dict:
+            # bs4 Tags hash by rendered content, so identical tags would
+            # collapse to one entry and rewriting an attribute would
+            # change the key's hash in place
+            css_targets = [(link, urljoin(url, link["href"]))
+                           for link in soup.find_all("link", rel="stylesheet")
+                           if link.get("href")]
+            js_targets = [(script, urljoin(url, script["src"]))
+                          for script in soup.find_all("script", src=True)]
+
+            # Process CSS and JavaScript files concurrently
             main_pbar.set_description("Processing CSS files")
-            css_files = set()
-            css_links = soup.find_all("link", rel="stylesheet")
-            with tqdm(total=len(css_links), desc="Downloading CSS files") as pbar:
-                for link in css_links:
-                    css_url = urljoin(url, link.get("href", ""))
-                    if css_url:
+            css_names = {}
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {executor.submit(_fetch_code_asset, session, css_url, "css"): css_url
+                           for css_url in {css_url for _, css_url in css_targets}}
+                with tqdm(total=len(futures), desc="Downloading CSS files") as pbar:
+                    for future in as_completed(futures):
                         try:
-                            css_response = requests.get(css_url, timeout=10)
-                            css_response.raise_for_status()
-                            css_content = cssbeautifier.beautify(css_response.text)
-                            css_name = get_safe_filename(css_url, "css")
-                            css_files.add(css_name)
+                            css_name, css_content = future.result()
+                            css_names[futures[future]] = css_name
                             code_files['css'][css_name] = css_content
                         except Exception as e:
-                            print(f"\nError downloading CSS: {css_url} - {str(e)}")
-                    pbar.update(1)
+                            print(f"\nError downloading CSS: {futures[future]} - {str(e)}")
+                        pbar.update(1)
             main_pbar.update(1)
 
-            # Process JavaScript files
             main_pbar.set_description("Processing JavaScript files")
-            js_files = set()
-            js_scripts = soup.find_all("script", src=True)
-            with tqdm(total=len(js_scripts), desc="Downloading JavaScript files") as pbar:
-                for script in js_scripts:
-                    js_url = urljoin(url, script.get("src", ""))
-                    if js_url:
+            js_names = {}
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {executor.submit(_fetch_code_asset, session, js_url, "js"): js_url
+                           for js_url in {js_url for _, js_url in js_targets}}
+                with tqdm(total=len(futures), desc="Downloading JavaScript files") as pbar:
+                    for future in as_completed(futures):
                         try:
-                            js_response = requests.get(js_url, timeout=10)
-                            js_response.raise_for_status()
-                            js_content = jsbeautifier.beautify(js_response.text)
-                            js_name = get_safe_filename(js_url, "js")
-                            js_files.add(js_name)
+                            js_name, js_content = future.result()
+                            js_names[futures[future]] = js_name
                             code_files['js'][js_name] = js_content
                         except Exception as e:
-                            print(f"\nError downloading JavaScript: {js_url} - {str(e)}")
-                    pbar.update(1)
+                            print(f"\nError downloading JavaScript: {futures[future]} - {str(e)}")
+                        pbar.update(1)
             main_pbar.update(1)
 
-            # Save files
-            main_pbar.set_description("Saving processed files")
-            
-            # Save HTML
-            with open(temp_dir / "index.html", 'w', encoding='utf-8') as f:
-                f.write(html_content)
-
-            # Save CSS files
-            for css_name, css_content in code_files['css'].items():
-                css_path = css_dir / css_name
-                with open(css_path, 'w', encoding='utf-8') as f:
-                    f.write(css_content)
-
-            # Save JavaScript files
-            for js_name, js_content in code_files['js'].items():
-                js_path = js_dir / js_name
-                with open(js_path, 'w', encoding='utf-8') as f:
-                    f.write(js_content)
-
-            # Update HTML paths
-            soup = BeautifulSoup(html_content, 'html.parser')
-            for link in soup.find_all("link", rel="stylesheet"):
-                if link.get("href"):
-                    css_name = get_safe_filename(urljoin(url, link["href"]), "css")
-                    if css_name in css_files:
-                        link["href"] = f"css/{css_name}"
-
-            for script in soup.find_all("script", src=True):
-                if script.get("src"):
-                    js_name = get_safe_filename(urljoin(url, script["src"]), "js")
-                    if js_name in js_files:
-                        script["src"] = f"js/{js_name}"
-
-            # Save updated HTML with fixed paths
-            with open(temp_dir / "index.html", 'w', encoding='utf-8') as f:
-                f.write(soup.prettify())
-            main_pbar.update(1)
+            # Update HTML paths on the original parse, straight from the
+            # element-to-URL map recorded above
+            main_pbar.set_description("Rewriting asset paths")
+            for link, css_url in css_targets:
+                css_name = css_names.get(css_url)
+                if css_name:
+                    link["href"] = f"css/{css_name}"
 
-            # Create zip archive
+            for script, js_url in js_targets:
+                js_name = js_names.get(js_url)
+                if js_name:
+                    script["src"] = f"js/{js_name}"
+
+            # Create zip archive straight from memory
             main_pbar.set_description("Creating zip archive")
             code_dir = Path('code')
             code_dir.mkdir(exist_ok=True)
             zip_name = code_dir / f"{site_name}-source-code.zip"
-            # Get list of all files to zip
-            files_to_zip = []
-            for folder, _, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(folder, file)
-                    files_to_zip.append((file_path, os.path.relpath(file_path, temp_dir)))
-
-            # Create zip archive
-            with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                with tqdm(total=len(files_to_zip), desc="Adding files to archive") as pbar:
-                    for file_path, arcname in files_to_zip:
-                        zipf.write(file_path, arcname)
+            entries = [("index.html", str(soup))]
+            entries.extend((f"css/{name}", content)
+                           for name, content in code_files['css'].items())
+            entries.extend((f"js/{name}", content)
+                           for name, content in code_files['js'].items())
+            with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
+                with tqdm(total=len(entries), desc="Adding files to archive") as pbar:
+                    for arcname, content in entries:
+                        zipf.writestr(arcname, content,
+                                      compress_type=_zip_compress_type(arcname))
                         pbar.update(1)
+            main_pbar.update(1)
 
-            # Clean up temporary directory
-            main_pbar.set_description("Cleaning up")
-            import shutil
-            shutil.rmtree(temp_dir)
-            
             print(f"\nWebsite code downloaded successfully!")
             print(f"Source code saved as: {zip_name}")
 
@@ -819,33 +1150,39 @@ def download_website_code(url):
 
 def download_with_crawler(url, media_type='image', download_folder=None,
                         max_size_mb=None, file_types=None, retry_count=3,
-                        max_depth=3, max_pages=100):
+                        max_depth=3, max_pages=100, max_workers=8,
+                        use_cache=True):
     """Download media files by crawling through website pages."""
     if download_folder is None:
         download_folder = media_type + 's'
     if max_size_mb is None:
         max_size_mb = 500 if media_type == 'video' else 10
 
-    crawler = WebCrawler(url, max_depth=max_depth, max_pages=max_pages)
+    crawler = WebCrawler(url, max_depth=max_depth, max_pages=max_pages,
+                         use_cache=use_cache)
     urls = crawler.crawl(media_type=media_type)
-    
+
     if not urls:
         print(f"No {media_type}s found while crawling.")
         return
-    
+
     download_media_from_urls(
         urls,
         download_folder,
         max_size_mb,
         file_types,
         retry_count,
-        media_type
-            )
+        media_type,
+        # Media bodies skip the cached session; only pages/CSS cache
+        session=get_shared_session() if crawler.uses_cache else crawler.session,
+        max_workers=max_workers
+    )
 
-def main():
+def interactive_main():
+    """Run the original interactive menu loop."""
     print("\nWebber - Media Downloader")
     print("Author: Sufyan Mughal (sufyanmughal522@gmail.com)")
-    
+
     while True:
         print("\nSelect Mode:")
         print("1. Download images from single page")
@@ -892,7 +1229,7 @@ def main():
             'font': '.woff,.ttf,.otf'
         }
         file_types_input = input(f"Enter allowed file extensions (e.g., {extensions_map[media_type]}) or press Enter for all: ")
-        file_types = [ext.strip().lower() for ext in file_types_input.split(',')] if file_types_input else None
+        file_types = frozenset(ext.strip().lower() for ext in file_types_input.split(',')) if file_types_input else None
 
         # Handle different modes
         if choice in ["1", "2", "3", "4"]:  # Single page downloads
@@ -934,5 +1271,75 @@ def main():
                     max_pages=max_pages
                 )
 
+def build_arg_parser():
+    """Build the argparse parser with one subcommand per download mode."""
+    parser = argparse.ArgumentParser(
+        prog='webber',
+        description='Download images, vectors, videos, fonts, and source code from websites.')
+    parser.add_argument('--interactive', action='store_true',
+                        help='launch the interactive menu')
+    subparsers = parser.add_subparsers(dest='command')
+
+    def add_common_arguments(sub, crawler=False):
+        sub.add_argument('url', help='website URL')
+        sub.add_argument('--max-size', type=int, default=None, metavar='MB',
+                         help='maximum file size in MB')
+        sub.add_argument('--file-types', default=None, metavar='EXTS',
+                         help='comma-separated allowed extensions (e.g. .jpg,.png)')
+        sub.add_argument('--workers', type=int, default=8, metavar='N',
+                         help='number of download threads (default 8)')
+        sub.add_argument('--no-cache', action='store_true',
+                         help='bypass the on-disk HTTP cache for page fetches')
+        if crawler:
+            sub.add_argument('--max-depth', type=int, default=3, metavar='N',
+                             help='maximum crawl depth (default 3)')
+            sub.add_argument('--max-pages', type=int, default=100, metavar='N',
+                             help='maximum pages to crawl (default 100)')
+
+    for media in ('images', 'vectors', 'videos', 'fonts'):
+        add_common_arguments(subparsers.add_parser(
+            f'single-{media}', help=f'download {media} from a single page'))
+        add_common_arguments(subparsers.add_parser(
+            f'crawl-{media}', help=f'crawl a website for {media}'), crawler=True)
+
+    code_parser = subparsers.add_parser('code', help='download website source code')
+    code_parser.add_argument('url', help='website URL')
+    return parser
+
+def main():
+    args = build_arg_parser().parse_args()
+
+    if args.command is None or args.interactive:
+        interactive_main()
+        return
+
+    if args.command == 'code':
+        download_website_code(args.url)
+        return
+
+    mode, media = args.command.split('-')
+    media_type = media[:-1]  # 'images' -> 'image'
+    # A frozenset gives O(1) membership tests in the per-URL filter
+    file_types = (frozenset(ext.strip().lower() for ext in args.file_types.split(','))
+                  if args.file_types else None)
+
+    use_cache = not args.no_cache
+
+    if media_type == 'font':
+        kwargs = dict(max_size_mb=args.max_size if args.max_size else 10,
+                      file_types=file_types, use_cache=use_cache)
+        if mode == 'crawl':
+            kwargs.update(max_depth=args.max_depth, max_pages=args.max_pages)
+        download_fonts(args.url, **kwargs)
+    elif mode == 'single':
+        download_from_single_page(args.url, media_type=media_type,
+                                  max_size_mb=args.max_size, file_types=file_types,
+                                  max_workers=args.workers, use_cache=use_cache)
+    else:
+        download_with_crawler(args.url, media_type=media_type,
+                              max_size_mb=args.max_size, file_types=file_types,
+                              max_depth=args.max_depth, max_pages=args.max_pages,
+                              max_workers=args.workers, use_cache=use_cache)
+
 if __name__ == "__main__":
     main()
@@ -1,38 +1,71 @@
 import time
 from groq import Groq
-import json
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import pickle
 import os
+import re
 from pathlib import Path
 
+# One client for every analyzer instance: each Groq() call would spin up
+# its own HTTP connection pool, and the key belongs in the environment,
+# not in source control
+_GROQ_CLIENT = None
+
+def _get_groq_client():
+    global _GROQ_CLIENT
+    if _GROQ_CLIENT is None:
+        _GROQ_CLIENT = Groq(api_key=os.environ["GROQ_API_KEY"])
+    return _GROQ_CLIENT
+
+# Pulls the analysis and improved-code sections out of a response in a
+# single scan, covering both reply formats the model produces
+_PARSE_RE = re.compile(
+    r'(?:ANALYSIS\s*)?(?P<analysis>.*?)\s*'
+    r'(?:\nIMPROVED CODE\n|\nHere is an improved version[^:\n]*:?)\s*'
+    r'(?P<code>.*)', re.S)
+
 class CodeAnalyzer:
-    """Analyze code using Groq's Qwen2.5-Coder model with caching"""
-    
-    def __init__(self):
-        self.client = Groq(api_key="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")
-        self.model = "mixtral-8x7b-32768"  # Using Mixtral for code analysis
+    """Analyze code through the Groq API with on-disk response caching"""
+
+    def __init__(self, model=None):
+        self.client = _get_groq_client()
+        # Model is swappable per instance or via the environment; the
+        # cache key includes it, so switching never serves stale results
+        self.model = model or os.environ.get("GROQ_MODEL", "mixtral-8x7b-32768")
         self.cache_dir = Path("cache")
         self.cache_dir.mkdir(exist_ok=True)
-    
+        # One directory listing up front replaces a stat call per lookup;
+        # only finished .pkl entries count, so a temp file left behind by
+        # a crash never registers as a hit
+        self._cache_index = {p.stem for p in self.cache_dir.glob("*.pkl")}
+
     def _get_cache_key(self, code, file_type):
         """Generate a cache key from code and file type"""
         content = f"{code}{file_type}{self.model}"
-        return hashlib.md5(content.encode()).hexdigest()
+        # blake2b is considerably faster than md5 on long inputs, and a
+        # cache key doesn't need a cryptographic guarantee anyway
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
     
     def _get_cached_response(self, cache_key):
         """Get cached analysis if available"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            print("Using cached analysis...")
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        return None
+        if cache_key not in self._cache_index:
+            return None
+        print("Using cached analysis...")
+        with open(self.cache_dir / f"{cache_key}.pkl", 'rb') as f:
+            return pickle.load(f)
     
     def _cache_response(self, cache_key, response):
         """Cache the analysis response"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, 'w') as f:
-            json.dump(response, f)
+        cache_file = self.cache_dir / f"{cache_key}.pkl"
+        # Write to a temp file and rename so a concurrent reader never
+        # sees a half-written entry; the .pkl.tmp name keeps it out of
+        # the *.pkl index scan
+        tmp_file = cache_file.with_suffix('.pkl.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(response, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+        self._cache_index.add(cache_key)
     
     def analyze_code(self, code, file_type):
         """Analyze code with caching support"""
@@ -89,20 +122,14 @@ IMPROVED CODE
             # Extract just the improved code part (skip the "```python" marks if present)
             response_text = response_text.replace("```python", "").replace("```", "")
             
-            # Parse response into analysis and improved code
-            parts = response_text.split("\nIMPROVED CODE\n")
-            if len(parts) == 2:
-                analysis = parts[0].replace("ANALYSIS\n", "").strip()
-                improved_code = parts[1].strip()
+            # Parse response into analysis and improved code in one pass
+            match = _PARSE_RE.fullmatch(response_text)
+            if match and match.group('code'):
+                analysis = match.group('analysis').strip()
+                improved_code = match.group('code').strip()
             else:
-                # Try alternative format that might be in the response
-                parts = response_text.split("\nHere is an improved version")
-                if len(parts) == 2:
-                    analysis = parts[0].replace("ANALYSIS\n", "").strip()
-                    improved_code = parts[1].split(":", 1)[1].strip() if ":" in parts[1] else parts[1].strip()
-                else:
-                    analysis = response_text.strip()
-                    improved_code = code  # Keep original if parsing fails
+                analysis = response_text.strip()
+                improved_code = code  # Keep original if parsing fails
                 
             result = {
                 "analysis": analysis,
@@ -120,6 +147,11 @@ IMPROVED CODE
                 "improved_code": code  # Return original code on error
             }
 
+    def analyze_many(self, items, max_workers=8):
+        """Analyze multiple (code, file_type) pairs concurrently"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda item: self.analyze_code(*item), items))
+
 def test_analyzer():
     """Test the code analyzer with a simple example"""
     